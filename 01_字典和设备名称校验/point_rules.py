@@ -0,0 +1,55 @@
+# 采集点校验规则：字典解析、单元格校验和设备分组一致性校验的列定义，供校验工具和入库工具共用
+import re
+
+# 同一设备名称下这些列的值必须一致
+GROUP_BY_COLUMN = "设备名称\n（必填）"
+GROUP_CHECK_COLUMNS = [
+    "基地\n（必选）",
+    "车间\n（必选）",
+    "工段\n（必选）",
+    "工序/系统\n（必选）",
+    "设备子类型\n（必选）"
+]
+
+
+# ========== 1. 解析 markdown 字典 ==========
+def parse_markdown_dict(md_file):
+    dictionary = {}
+    current_header = None
+
+    with open(md_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("##"):
+                match = re.match(r'##\s*(.+)', line)
+                if match:
+                    header = match.group(1).strip().replace('\\n', '\n')
+                    current_header = header
+                    dictionary[current_header] = []
+            elif line.startswith("-") and current_header:
+                item = line[1:].strip()
+                if item == "（此列为必填，但无固定枚举值）":
+                    dictionary[current_header] = []  # 空列表表示无需枚举校验
+                else:
+                    dictionary[current_header].append(item)
+
+    return dictionary
+
+
+# ========== 2. 单元格校验函数 ==========
+def validate_cell(value, column_name, dictionary):
+    value = str(value).strip() if value is not None else ""
+
+    # 清理全角空格、换行符、制表符
+    value = re.sub(r'[\u3000\n\r\t]', '', value)
+
+    # 必填项检查
+    if value == "":
+        return "为空", value
+
+    # 枚举值检查（如果该列有枚举值）
+    enum_values = dictionary.get(column_name, [])
+    if len(enum_values) > 0 and value not in enum_values:
+        return "与字典不符", value
+
+    return "通过", value  # 默认通过
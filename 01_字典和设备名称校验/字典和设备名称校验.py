@@ -8,48 +8,7 @@ from openpyxl.styles import PatternFill
 from openpyxl.utils import get_column_letter
 import copy
 
-
-# ========== 1. 解析 markdown 字典 ==========
-def parse_markdown_dict(md_file):
-    dictionary = {}
-    current_header = None
-
-    with open(md_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("##"):
-                match = re.match(r'##\s*(.+)', line)
-                if match:
-                    header = match.group(1).strip().replace('\\n', '\n')
-                    current_header = header
-                    dictionary[current_header] = []
-            elif line.startswith("-") and current_header:
-                item = line[1:].strip()
-                if item == "（此列为必填，但无固定枚举值）":
-                    dictionary[current_header] = []  # 空列表表示无需枚举校验
-                else:
-                    dictionary[current_header].append(item)
-
-    return dictionary
-
-
-# ========== 2. 单元格校验函数 ==========
-def validate_cell(value, column_name, dictionary):
-    value = str(value).strip() if value is not None else ""
-
-    # 清理全角空格、换行符、制表符
-    value = re.sub(r'[\u3000\n\r\t]', '', value)
-
-    # 必填项检查
-    if value == "":
-        return "为空", value
-
-    # 枚举值检查（如果该列有枚举值）
-    enum_values = dictionary.get(column_name, [])
-    if len(enum_values) > 0 and value not in enum_values:
-        return "与字典不符", value
-
-    return "通过", value  # 默认通过
+from point_rules import GROUP_BY_COLUMN, GROUP_CHECK_COLUMNS, parse_markdown_dict, validate_cell
 
 
 # ========== 4. 主程序类 ==========
@@ -163,14 +122,8 @@ class ExcelValidatorApp:
         针对同一设备名称的采集点，检查指定字段是否一致
         使用 value_counts 找出出现次数最多的值作为参考值，避免 mode() 返回多个值的问题
         """
-        group_by_column = "设备名称\n（必填）"
-        check_columns = [
-            "基地\n（必选）",
-            "车间\n（必选）",
-            "工段\n（必选）",
-            "工序/系统\n（必选）",
-            "设备子类型\n（必选）"
-        ]
+        group_by_column = GROUP_BY_COLUMN
+        check_columns = GROUP_CHECK_COLUMNS
         valid_check_columns = [col for col in check_columns if col in headers]
         grouped = df.groupby(group_by_column)
         self.log_message("\n🔍 开始校验同一设备名称下的字段一致性...")
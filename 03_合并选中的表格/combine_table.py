@@ -7,6 +7,128 @@ import os
 import threading
 
 
+# 采集点主键列：同一设备下的同名采集点视为同一个点位（按去掉"（必填）"等后缀后的列名匹配）
+POINT_KEY_COLUMNS = ["设备名称", "采集点名称"]
+SOURCE_COLUMN = "来源文件"
+
+# 预扫描参数：只读取每个工作表的前几行来识别列名行
+PRESCAN_ROWS = 10
+# 采集点表的特征列名，命中数达到阈值时采用识别出的列名行，否则按手动设置的列名行读取
+POINT_COLUMN_HINTS = ["数据源名称", "采集点名称", "寄存器地址", "数据类型", "读写权限", "设备名称"]
+MIN_POINT_COLUMN_HITS = 2
+
+
+# ========== 列名行识别 ==========
+def scan_sheet_header(preview, hints=POINT_COLUMN_HINTS):
+    """
+    在预读的前几行（header=None）中识别列名所在行
+    优先选择命中采集点特征列名最多的行，其次选择文本单元格最多的行
+    返回 {"header_row": 列名行(0-indexed), "hits": 命中特征列数, "usecols": 有列名的列位置}
+    前几行没有任何文本单元格时返回 None
+    """
+    best = None
+    for row_idx in range(len(preview)):
+        cells = {}
+        for col_idx, value in enumerate(preview.iloc[row_idx]):
+            if isinstance(value, str) and value.strip():
+                cells[col_idx] = value.strip()
+        if not cells:
+            continue
+
+        hits = sum(1 for hint in hints if any(hint in cell for cell in cells.values()))
+        # 同分时保留较早的行，避免把数据行误认为列名行
+        score = (hits, len(cells))
+        if best is None or score > best[0]:
+            best = (score, row_idx, sorted(cells))
+
+    if best is None:
+        return None
+    (hits, _), header_row, usecols = best
+    return {"header_row": header_row, "hits": hits, "usecols": usecols}
+
+
+# ========== 合并后去重与冲突检测 ==========
+def normalize_header(name):
+    """去掉列名中换行后的"（必填）"/"（必选）"说明，只保留字段名"""
+    return str(name).split("\n")[0].strip() if name is not None else ""
+
+
+def find_key_columns(df, key_columns=POINT_KEY_COLUMNS):
+    """
+    按规范化后的列名查找主键列，返回实际列名列表
+    缺少任一主键列时返回 None，避免主键被缩短后误判
+    """
+    normalized = {}
+    for col in df.columns:
+        normalized.setdefault(normalize_header(col), col)
+    if any(key not in normalized for key in key_columns):
+        return None
+    return [normalized[key] for key in key_columns]
+
+
+def hash_rows(df):
+    """
+    向量化计算每行的 uint64 哈希值
+    object 列先统一转成文本（空值保持为空），数字 1 和文本 '1' 按相同的值比较，不依赖 pandas 对混合类型的处理
+    """
+    frame = df.copy()
+    for col in frame.columns:
+        if frame[col].dtype == object:
+            frame[col] = frame[col].where(frame[col].isna(), frame[col].astype(str))
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def drop_duplicate_rows(df, ignore_columns=(SOURCE_COLUMN,)):
+    """
+    基于行哈希去除完全重复的行，返回 (去重后的DataFrame, 删除行数)
+    比较时忽略来源文件列，同一点位无论来自哪个文件都只保留第一次出现的行
+    object 列按文本比较（见 hash_rows），保留的行维持原始值
+    """
+    value_columns = [col for col in df.columns if col not in ignore_columns]
+    if df.empty or not value_columns:
+        return df, 0
+
+    duplicated = pd.Series(hash_rows(df[value_columns])).duplicated().to_numpy()
+    removed = int(duplicated.sum())
+    if removed == 0:
+        return df, 0
+    return df.loc[~duplicated].reset_index(drop=True), removed
+
+
+def find_key_conflicts(df, key_columns=POINT_KEY_COLUMNS, source_column=SOURCE_COLUMN):
+    """
+    查找主键相同但其他属性不同的冲突组
+    返回列表，每项为 {"key": 主键值, "rows": 行数, "sources": 来源文件列表}
+    """
+    key_columns = find_key_columns(df, key_columns)
+    if df.empty or key_columns is None:
+        return []
+
+    # 只对主键重复的行做进一步比较，主键为空的行不参与
+    candidate_mask = df[key_columns].notna().all(axis=1) & df.duplicated(subset=key_columns, keep=False)
+    if not candidate_mask.any():
+        return []
+    candidates = df.loc[candidate_mask]
+
+    attr_columns = [col for col in df.columns if col not in key_columns and col != source_column]
+    if not attr_columns:
+        return []
+    attr_hash = hash_rows(candidates[attr_columns])
+
+    conflicts = []
+    grouped = candidates.assign(_attr_hash=attr_hash).groupby(key_columns, sort=False)
+    for key, group in grouped:
+        if group["_attr_hash"].nunique() <= 1:
+            continue
+        if source_column in group.columns:
+            sources = sorted(group[source_column].dropna().astype(str).unique())
+        else:
+            sources = []
+        conflicts.append({"key": key, "rows": len(group), "sources": sources})
+
+    return conflicts
+
+
 class ExcelMergerApp:
     def __init__(self, root):
         self.root = root
@@ -34,9 +156,20 @@ class ExcelMergerApp:
 
         ttk.Label(header_frame, text="列名所在行:").pack(side=tk.LEFT)
         self.header_row = tk.IntVar(value=1)
-        header_spinbox = ttk.Spinbox(header_frame, from_=1, to=10, width=5,
-                                     textvariable=self.header_row)
-        header_spinbox.pack(side=tk.LEFT, padx=5)
+        self.header_spinbox = ttk.Spinbox(header_frame, from_=1, to=10, width=5,
+                                          textvariable=self.header_row)
+        self.header_spinbox.pack(side=tk.LEFT, padx=5)
+
+        self.auto_detect = tk.BooleanVar(value=True)
+        ttk.Checkbutton(header_frame, text="自动识别采集点列名行",
+                        variable=self.auto_detect,
+                        command=self.update_header_options).pack(side=tk.LEFT, padx=10)
+
+        self.points_only = tk.BooleanVar(value=False)
+        self.points_only_check = ttk.Checkbutton(header_frame, text="仅合并采集点工作表",
+                                                 variable=self.points_only,
+                                                 command=self.update_header_options)
+        self.points_only_check.pack(side=tk.LEFT, padx=5)
 
         # 文件选择区域
         file_frame = ttk.Frame(self.main_frame)
@@ -81,6 +214,7 @@ class ExcelMergerApp:
 
         # 初始化
         self.selected_files = []
+        self.update_header_options()
         self.log("就绪: 请选择Excel文件进行合并")
 
     def log(self, message):
@@ -113,6 +247,16 @@ class ExcelMergerApp:
             self.log(f"已选择 {file_count} 个Excel文件")
             self.update_status(f"已选择 {file_count} 个文件", "green")
 
+    def update_header_options(self):
+        """根据识别选项启用/禁用列名行设置"""
+        auto_detect = self.auto_detect.get()
+        self.points_only_check.config(state="normal" if auto_detect else "disabled")
+        # 只合并采集点工作表时，列名行全部由自动识别决定，手动设置不再生效
+        if auto_detect and self.points_only.get():
+            self.header_spinbox.config(state="disabled")
+        else:
+            self.header_spinbox.config(state="normal")
+
     def update_status(self, message, color="black"):
         """更新状态标签"""
         self.status_label.config(text=message, foreground=color)
@@ -137,6 +281,8 @@ class ExcelMergerApp:
         """执行Excel文件合并"""
         try:
             header_row = self.header_row.get() - 1  # pandas使用0-indexed
+            auto_detect = self.auto_detect.get()
+            points_only = auto_detect and self.points_only.get()
 
             # 收集所有文件中所有sheet的信息
             sheets_data = {}
@@ -157,8 +303,28 @@ class ExcelMergerApp:
 
                         for sheet_name in sheet_names:
                             try:
-                                # 读取工作表数据
-                                df = pd.read_excel(xls, sheet_name=sheet_name, header=header_row)
+                                scan = None
+                                if auto_detect:
+                                    # 预扫描前几行，识别列名行
+                                    preview = pd.read_excel(xls, sheet_name=sheet_name, header=None,
+                                                            nrows=PRESCAN_ROWS)
+                                    scan = scan_sheet_header(preview)
+                                    if scan is None or scan["hits"] < MIN_POINT_COLUMN_HITS:
+                                        if points_only:
+                                            self.log(f"  - 跳过非采集点工作表: {sheet_name}")
+                                            continue
+                                        self.log(f"  - 工作表 '{sheet_name}' 未识别到采集点列名，"
+                                                 f"按第 {header_row + 1} 行作为列名读取")
+                                        scan = None
+
+                                if scan is not None:
+                                    self.log(f"  - 工作表 '{sheet_name}' 识别列名行: 第 {scan['header_row'] + 1} 行")
+                                    # 只读取有列名的列
+                                    df = pd.read_excel(xls, sheet_name=sheet_name, header=scan["header_row"],
+                                                       usecols=scan["usecols"])
+                                else:
+                                    # 读取工作表数据
+                                    df = pd.read_excel(xls, sheet_name=sheet_name, header=header_row)
 
                                 # 忽略空工作表
                                 if df.empty:
@@ -239,6 +405,20 @@ class ExcelMergerApp:
                     all_columns.append("来源文件")
                 merged_df = merged_df[all_columns]
 
+                # 只对含采集点主键列的工作表去重，其他工作表中相同的行可能是正常数据
+                if find_key_columns(merged_df) is not None:
+                    merged_df, removed = drop_duplicate_rows(merged_df)
+                    if removed:
+                        self.log(f"  - 去除完全重复的采集点行: {removed} 行")
+
+                    # 主键相同但属性不同的点位，列出冲突组及来源文件
+                    conflicts = find_key_conflicts(merged_df)
+                    if conflicts:
+                        self.log(f"  - 警告: 发现 {len(conflicts)} 组主键冲突（同一点位属性不一致）")
+                        for conflict in conflicts:
+                            key_text = " / ".join(str(v).replace('\n', ' ') for v in conflict["key"])
+                            self.log(f"    · {key_text} ({conflict['rows']} 行) 来源文件: {', '.join(conflict['sources'])}")
+
                 merged_data[sheet_name] = merged_df
 
             # 生成输出文件名
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from combine_table import drop_duplicate_rows, find_key_columns, find_key_conflicts, scan_sheet_header
+
+
+def test_drop_duplicate_rows_ignores_source_file():
+    df = pd.DataFrame({
+        "设备名称\n（必填）": ["A", "A", "A"],
+        "采集点名称": ["运行状态", "运行状态", "温度"],
+        "来源文件": ["a.xlsx", "b.xlsx", "a.xlsx"],
+    })
+
+    deduped, removed = drop_duplicate_rows(df)
+
+    assert removed == 1
+    assert deduped["来源文件"].tolist() == ["a.xlsx", "a.xlsx"]
+
+
+def test_drop_duplicate_rows_compares_object_columns_as_text():
+    df = pd.DataFrame({"寄存器地址": [1, "1", np.nan, np.nan], "来源文件": ["a", "b", "a", "b"]})
+
+    deduped, removed = drop_duplicate_rows(df)
+
+    assert removed == 2
+    assert deduped["寄存器地址"].tolist()[0] == 1
+
+
+def test_find_key_columns_requires_all_key_columns():
+    assert find_key_columns(pd.DataFrame(columns=["设备名称\n（必填）", "采集点名称"])) == ["设备名称\n（必填）", "采集点名称"]
+    assert find_key_columns(pd.DataFrame(columns=["采集点名称", "数据类型"])) is None
+
+
+def test_find_key_conflicts_skips_sheet_without_all_key_columns():
+    df = pd.DataFrame({
+        "采集点名称": ["运行状态", "运行状态"],
+        "设备编号": ["d1", "d2"],
+        "来源文件": ["a.xlsx", "b.xlsx"],
+    })
+
+    assert find_key_conflicts(df) == []
+
+
+def test_find_key_conflicts_lists_source_files():
+    df = pd.DataFrame({
+        "设备名称": ["d1", "d1", "d2", "d1"],
+        "采集点名称": ["运行状态", "运行状态", "运行状态", "温度"],
+        "数据类型": ["int", "bool", "int", "float"],
+        "来源文件": ["b.xlsx", "a.xlsx", "a.xlsx", "c.xlsx"],
+    })
+
+    assert find_key_conflicts(df) == [
+        {"key": ("d1", "运行状态"), "rows": 2, "sources": ["a.xlsx", "b.xlsx"]},
+    ]
+
+
+def test_scan_sheet_header_skips_title_row():
+    preview = pd.DataFrame([
+        ["某项目采集点表", np.nan, np.nan, np.nan],
+        ["数据源名称\n（必选）", "采集点名称", np.nan, "设备名称\n（必填）"],
+        ["ds", "运行状态", "备注", "A"],
+    ])
+
+    assert scan_sheet_header(preview) == {"header_row": 1, "hits": 3, "usecols": [0, 1, 3]}
+
+
+def test_scan_sheet_header_with_blank_first_row():
+    preview = pd.DataFrame([
+        [np.nan, np.nan],
+        ["采集点名称", "寄存器地址"],
+        ["运行状态", 40001],
+    ])
+
+    assert scan_sheet_header(preview) == {"header_row": 1, "hits": 2, "usecols": [0, 1]}
+
+
+def test_scan_sheet_header_non_point_sheet():
+    preview = pd.DataFrame([["状态（必填）", "服务编码（必填）"], ["启用", "S01"]])
+
+    assert scan_sheet_header(preview)["hits"] == 0
+    assert scan_sheet_header(pd.DataFrame([[2024, 1.5], [2025, 2.5]])) is None
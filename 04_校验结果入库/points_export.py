@@ -0,0 +1,438 @@
+import csv
+import io
+import os
+import re
+import sqlite3
+import sys
+import threading
+import tkinter as tk
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import islice
+from tkinter import ttk, filedialog, scrolledtext, messagebox
+
+from openpyxl import load_workbook
+
+# 校验规则与采集点校验工具共用 point_rules 模块（单独打包时用 --paths 指向该目录）
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "01_字典和设备名称校验")
+sys.path.append(RULES_DIR)
+from point_rules import GROUP_BY_COLUMN, GROUP_CHECK_COLUMNS, parse_markdown_dict, validate_cell  # noqa: E402
+
+# PostgreSQL 连接配置 - 请替换为实际凭据
+db_config = {
+    'host': 'localhost',
+    'port': '5432',
+    'database': 'ems_test',
+    'user': 'your_user',  # 替换为您的用户名
+    'password': 'your_password'  # 替换为您的密码
+}
+
+# 采集点表格式：与校验工具一致，第2行为列名，第3行开始为数据
+SHEET_NAME = "采集点"
+HEADER_ROW = 2
+# 采集点主键列（去掉"（必填）"等后缀后的列名）
+POINT_KEY_COLUMNS = ["设备名称", "采集点名称"]
+TABLE_NAME = "iot_data_point"
+# 校验字典：依次在当前目录和采集点校验工具目录中查找，也可在界面中手动选择
+DICT_FILE_NAME = "采集表校验字典.md"
+BATCH_SIZE = 5000
+
+
+# ========== 1. 流式读取并校验采集点表 ==========
+def normalize_header(name):
+    """去掉列名中换行后的"（必填）"/"（必选）"说明，只保留字段名"""
+    return str(name).split("\n")[0].strip() if name is not None else ""
+
+
+def clean_value(value):
+    """清理全角空格、换行符、制表符，空字符串写入数据库时记为 NULL"""
+    if value is None:
+        return None
+    value = re.sub(r'[\u3000\n\r\t]', '', str(value)).strip()
+    return value if value != "" else None
+
+
+def find_dict_file():
+    """查找校验字典文件，找不到时返回 None"""
+    for directory in (os.getcwd(), RULES_DIR):
+        path = os.path.join(directory, DICT_FILE_NAME)
+        if os.path.exists(path):
+            return os.path.abspath(path)
+    return None
+
+
+def load_validation_rules(dict_file):
+    """
+    按采集点校验工具的字典规则返回校验函数 check(列名, 值)
+    字典中的列名按规范化后的字段名匹配，不在字典中的列直接通过
+    """
+    if not dict_file or not os.path.exists(dict_file):
+        raise FileNotFoundError(f"未找到校验字典文件 {DICT_FILE_NAME}，请点击\"选择校验字典\"指定字典文件")
+
+    dictionary = {normalize_header(name): values for name, values in parse_markdown_dict(dict_file).items()}
+
+    def check(column_name, value):
+        if column_name not in dictionary:
+            return "通过"
+        result, _ = validate_cell(value, column_name, dictionary)
+        return result
+
+    return check
+
+
+class PointRows:
+    """
+    以只读模式打开 Excel 的采集点工作表，逐行产出清理后的元组，不会把整张表读入内存
+    完全空白的行直接跳过；主键为空、未通过 validate 或设备分组一致性校验的行不会产出，记录在 rejected 中
+    分组一致性校验需要先扫描一遍工作表，统计每个设备各属性出现次数最多的值作为参考值
+    使用 with 语句或调用 close() 关闭工作簿
+    """
+
+    def __init__(self, file_path, validate=None, check_groups=False, sheet_name=SHEET_NAME,
+                 header_row=HEADER_ROW, key_columns=POINT_KEY_COLUMNS):
+        self.header_row = header_row
+        self.validate = validate
+        self.rejected = []  # 未通过校验的行 (行号, 列名, 校验结果)
+        self.wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            self.ws = self.wb[sheet_name]
+            header_cells = next(self.ws.iter_rows(min_row=header_row, max_row=header_row, values_only=True), ())
+            self.positions, self.columns = [], []
+            for col_idx, name in enumerate(header_cells):
+                name = normalize_header(name)
+                # 忽略无列名的列和重复列名
+                if name and name not in self.columns:
+                    self.positions.append(col_idx)
+                    self.columns.append(name)
+
+            missing = [col for col in key_columns if col not in self.columns]
+            if missing:
+                raise ValueError(f"工作表 '{sheet_name}' 缺少主键列: {', '.join(missing)}")
+            self.key_positions = [self.columns.index(col) for col in key_columns]
+
+            # 设备分组一致性校验的列位置
+            self.group_position = None
+            self.group_check_positions = []
+            group_column = normalize_header(GROUP_BY_COLUMN)
+            if check_groups and group_column in self.columns:
+                self.group_position = self.columns.index(group_column)
+                self.group_check_positions = [self.columns.index(normalize_header(col))
+                                              for col in GROUP_CHECK_COLUMNS
+                                              if normalize_header(col) in self.columns]
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.wb.close()
+
+    def iter_cleaned_rows(self):
+        """逐行产出 (行号, 清理后的元组)，跳过完全空白的行"""
+        for row_number, raw in enumerate(self.ws.iter_rows(min_row=self.header_row + 1, values_only=True),
+                                         start=self.header_row + 1):
+            row = tuple(clean_value(raw[i]) if i < len(raw) else None for i in self.positions)
+            if all(value is None for value in row):
+                continue
+            yield row_number, row
+
+    def build_group_references(self):
+        """第一遍扫描：统计每个设备各分组列出现次数最多的值，返回 {(设备名称, 列位置): 参考值}"""
+        if self.group_position is None or not self.group_check_positions:
+            return {}
+        counters = defaultdict(Counter)
+        for _, row in self.iter_cleaned_rows():
+            device_name = row[self.group_position]
+            if device_name is None:
+                continue
+            for i in self.group_check_positions:
+                counters[(device_name, i)][row[i]] += 1
+        return {key: counter.most_common(1)[0][0] for key, counter in counters.items()}
+
+    def __iter__(self):
+        references = self.build_group_references()
+        for row_number, row in self.iter_cleaned_rows():
+            error = self.check_row(row, references)
+            if error:
+                self.rejected.append((row_number,) + error)
+                continue
+            yield row
+
+    def check_row(self, row, references):
+        """返回第一个未通过校验的 (列名, 校验结果)，全部通过时返回 None"""
+        for i in self.key_positions:
+            if row[i] is None:
+                return self.columns[i], "为空"
+
+        if self.validate:
+            for col_name, value in zip(self.columns, row):
+                result = self.validate(col_name, value)
+                if result != "通过":
+                    return col_name, result
+
+        if references:
+            device_name = row[self.group_position]
+            for i in self.group_check_positions:
+                reference = references.get((device_name, i))
+                if row[i] != reference:
+                    return self.columns[i], f"与同一设备的参考值'{reference}'不一致"
+        return None
+
+
+def read_point_rows(file_path, validate=None, check_groups=False, sheet_name=SHEET_NAME,
+                    header_row=HEADER_ROW, key_columns=POINT_KEY_COLUMNS):
+    """打开采集点工作表，返回 PointRows（可迭代，带 columns 属性，需关闭）"""
+    return PointRows(file_path, validate=validate, check_groups=check_groups, sheet_name=sheet_name,
+                     header_row=header_row, key_columns=key_columns)
+
+
+def iter_batches(rows, batch_size=BATCH_SIZE):
+    """把行迭代器切分为固定大小的批次"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+# ========== 2. 写入数据库（按主键 upsert） ==========
+def quote_identifier(name):
+    """SQLite 和 PostgreSQL 通用的标识符转义"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def build_create_table_sql(table, columns, key_columns):
+    column_defs = ", ".join(f"{quote_identifier(col)} TEXT" for col in columns)
+    key_list = ", ".join(quote_identifier(col) for col in key_columns)
+    return f"CREATE TABLE IF NOT EXISTS {quote_identifier(table)} ({column_defs}, PRIMARY KEY ({key_list}))"
+
+
+def build_conflict_clause(columns, key_columns):
+    key_list = ", ".join(quote_identifier(col) for col in key_columns)
+    updates = [f"{quote_identifier(col)} = excluded.{quote_identifier(col)}"
+               for col in columns if col not in key_columns]
+    if not updates:
+        return f"ON CONFLICT ({key_list}) DO NOTHING"
+    return f"ON CONFLICT ({key_list}) DO UPDATE SET {', '.join(updates)}"
+
+
+def export_to_sqlite(db_path, columns, rows, table=TABLE_NAME, key_columns=POINT_KEY_COLUMNS,
+                     batch_size=BATCH_SIZE, progress=None):
+    """
+    分批 executemany 写入 SQLite，每批一个事务；主键相同的行以后出现的为准
+    返回 (读取行数, 写入的点位数)，点位数按去重后的主键计算
+    """
+    column_list = ", ".join(quote_identifier(col) for col in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    insert_sql = (f"INSERT INTO {quote_identifier(table)} ({column_list}) VALUES ({placeholders}) "
+                  f"{build_conflict_clause(columns, key_columns)}")
+
+    key_positions = [columns.index(col) for col in key_columns]
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.execute(build_create_table_sql(table, columns, key_columns))
+
+        total, keys = 0, set()
+        for batch in iter_batches(rows, batch_size):
+            with conn:
+                conn.executemany(insert_sql, batch)
+            total += len(batch)
+            keys.update(tuple(row[i] for i in key_positions) for row in batch)
+            if progress:
+                progress(total, len(keys))
+        return total, len(keys)
+    finally:
+        conn.close()
+
+
+def export_to_postgres(config, columns, rows, table=TABLE_NAME, key_columns=POINT_KEY_COLUMNS,
+                       batch_size=BATCH_SIZE, progress=None):
+    """
+    每批先用 COPY 流式写入临时表，再 INSERT ... ON CONFLICT 合并到目标表，每批一个事务
+    同一批内主键重复时以后出现的行为准；返回 (读取行数, 写入的点位数)，点位数按去重后的主键计算
+    """
+    import psycopg2  # 仅在导出到 PostgreSQL 时需要
+
+    staging = quote_identifier(f"{table}_staging")
+    column_list = ", ".join(quote_identifier(col) for col in columns)
+    key_list = ", ".join(quote_identifier(col) for col in key_columns)
+    staging_defs = ", ".join(f"{quote_identifier(col)} TEXT" for col in columns)
+
+    copy_sql = f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    merge_sql = (f"INSERT INTO {quote_identifier(table)} ({column_list}) "
+                 f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {staging} "
+                 f"ORDER BY {key_list}, _seq DESC "
+                 f"{build_conflict_clause(columns, key_columns)}")
+
+    key_positions = [columns.index(col) for col in key_columns]
+    conn = psycopg2.connect(**config)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(build_create_table_sql(table, columns, key_columns))
+            cur.execute(f"CREATE TEMP TABLE {staging} (_seq BIGSERIAL, {staging_defs}) ON COMMIT DELETE ROWS")
+        conn.commit()
+
+        total, keys = 0, set()
+        for batch in iter_batches(rows, batch_size):
+            # 空值写成未加引号的空字段，COPY csv 会将其识别为 NULL
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+            with conn.cursor() as cur:
+                cur.copy_expert(copy_sql, buffer)
+                cur.execute(merge_sql)
+            conn.commit()
+            total += len(batch)
+            keys.update(tuple(row[i] for i in key_positions) for row in batch)
+            if progress:
+                progress(total, len(keys))
+        return total, len(keys)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+# ========== 3. 主程序类 ==========
+class PointExportApp:
+    def __init__(self, root):
+        self.root = root
+        root.title("采集点批量入库工具")
+        root.geometry("700x500")
+
+        self.main_frame = ttk.Frame(root, padding="10")
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # 文件选择区域
+        file_frame = ttk.Frame(self.main_frame)
+        file_frame.grid(row=0, column=0, columnspan=3, sticky="we", pady=5)
+        ttk.Button(file_frame, text="选择Excel文件", command=self.select_file).pack(side=tk.LEFT, padx=5)
+        self.file_label = ttk.Label(file_frame, text="未选择文件")
+        self.file_label.pack(side=tk.LEFT, padx=5)
+
+        # 校验字典
+        dict_frame = ttk.Frame(self.main_frame)
+        dict_frame.grid(row=1, column=0, columnspan=3, sticky="we", pady=5)
+        ttk.Button(dict_frame, text="选择校验字典", command=self.select_dict_file).pack(side=tk.LEFT, padx=5)
+        self.dict_label = ttk.Label(dict_frame, text="")
+        self.dict_label.pack(side=tk.LEFT, padx=5)
+
+        # 目标数据库
+        target_frame = ttk.Frame(self.main_frame)
+        target_frame.grid(row=2, column=0, columnspan=3, sticky="w", pady=5)
+        ttk.Label(target_frame, text="目标数据库:").pack(side=tk.LEFT)
+        self.target = tk.StringVar(value="sqlite")
+        ttk.Radiobutton(target_frame, text="本地SQLite文件", value="sqlite",
+                        variable=self.target).pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(target_frame, text="PostgreSQL", value="postgres",
+                        variable=self.target).pack(side=tk.LEFT, padx=5)
+
+        # 日志区域
+        ttk.Label(self.main_frame, text="操作日志:").grid(row=3, column=0, sticky="w", pady=(15, 5))
+        self.log_area = scrolledtext.ScrolledText(self.main_frame, width=85, height=18)
+        self.log_area.grid(row=4, column=0, columnspan=3, sticky="we")
+
+        # 按钮区域
+        button_frame = ttk.Frame(self.main_frame)
+        button_frame.grid(row=5, column=0, columnspan=3, pady=15)
+        ttk.Button(button_frame, text="开始入库", command=self.start_export_thread).pack(side=tk.LEFT, padx=10)
+        ttk.Button(button_frame, text="退出", command=root.destroy).pack(side=tk.LEFT, padx=10)
+
+        self.file_path = None
+        self.dict_file = find_dict_file()
+        self.dict_label.config(text=self.dict_file or "未找到校验字典，请手动选择")
+        self.log(f"就绪: 请选择要入库的Excel文件（'{SHEET_NAME}'工作表，第{HEADER_ROW}行为列名）")
+
+    def log(self, message):
+        """添加日志消息"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log_area.insert(tk.END, f"[{timestamp}] {message}\n")
+        self.log_area.see(tk.END)
+        self.root.update_idletasks()
+
+    def select_file(self):
+        """选择要入库的Excel文件"""
+        file_path = filedialog.askopenfilename(filetypes=[("Excel文件", "*.xlsx")])
+        if file_path:
+            self.file_path = file_path
+            self.file_label.config(text=os.path.basename(file_path))
+            self.log(f"已选择文件: {file_path}")
+
+    def select_dict_file(self):
+        """选择校验字典文件"""
+        dict_file = filedialog.askopenfilename(filetypes=[("Markdown文件", "*.md")])
+        if dict_file:
+            self.dict_file = dict_file
+            self.dict_label.config(text=dict_file)
+            self.log(f"已选择校验字典: {dict_file}")
+
+    def start_export_thread(self):
+        """启动入库线程以防止GUI冻结"""
+        if not self.file_path:
+            messagebox.showwarning("警告", "请先选择要入库的Excel文件")
+            return
+        if not self.dict_file:
+            messagebox.showwarning("警告", f"未找到校验字典文件 {DICT_FILE_NAME}，请先选择校验字典")
+            return
+
+        db_path = None
+        if self.target.get() == "sqlite":
+            db_path = filedialog.asksaveasfilename(defaultextension=".db",
+                                                   filetypes=[("SQLite数据库", "*.db *.sqlite")],
+                                                   confirmoverwrite=False)
+            if not db_path:
+                return
+
+        thread = threading.Thread(target=self.export_points, args=(db_path,))
+        thread.daemon = True
+        thread.start()
+
+    def export_points(self, db_path):
+        """执行入库"""
+        try:
+            validate = load_validation_rules(self.dict_file)
+            with read_point_rows(self.file_path, validate=validate, check_groups=True) as rows:
+                columns = rows.columns
+                self.log(f"读取列: {len(columns)} 列，主键: {' + '.join(POINT_KEY_COLUMNS)}")
+
+                def progress(total, written):
+                    self.log(f"  - 已处理 {total} 行，写入 {written} 个点位")
+
+                if db_path:
+                    total, written = export_to_sqlite(db_path, columns, rows, progress=progress)
+                    target = db_path
+                else:
+                    total, written = export_to_postgres(db_config, columns, rows, progress=progress)
+                    target = f"{db_config['host']}/{db_config['database']}"
+
+                rejected = rows.rejected
+
+            if rejected:
+                self.log(f"⚠️ 校验未通过，跳过 {len(rejected)} 行：")
+                for row_number, col_name, result in rejected:
+                    self.log(f"  - 行号 {row_number} 列名 {col_name} {result}")
+
+            self.log(f"入库完成! 共处理 {total} 行，写入 {written} 个点位到 {target} 的 {TABLE_NAME} 表")
+            messagebox.showinfo("完成", f"入库完成!\n共处理 {total} 行，写入 {written} 个点位\n"
+                                      f"校验未通过跳过 {len(rejected)} 行")
+        except Exception as e:
+            self.log(f"入库过程中发生错误: {str(e)}")
+            messagebox.showerror("错误", f"入库过程中发生错误:\n{str(e)}")
+
+
+def main():
+    root = tk.Tk()
+    app = PointExportApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+from openpyxl import Workbook
+
+from points_export import RULES_DIR, TABLE_NAME, export_to_sqlite, load_validation_rules, read_point_rows
+
+DICT_FILE = f"{RULES_DIR}/采集表校验字典.md"
+
+
+def build_workbook(path, rows, headers=("设备名称\n（必填）", "采集点名称", "数据类型\n（必选）", "设备属性\n（必选）")):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "采集点"
+    ws.append(["某项目采集点表"])
+    ws.append(list(headers))
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def fetch_points(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f'SELECT * FROM "{TABLE_NAME}" ORDER BY 1, 2').fetchall()
+    finally:
+        conn.close()
+
+
+def test_export_to_sqlite_upserts_and_rejects_empty_keys(tmp_path):
+    xlsx = tmp_path / "points.xlsx"
+    db_path = tmp_path / "points.db"
+    build_workbook(xlsx, [
+        ["A", "运行状态", "int", "生产设备"],
+        ["A", "温度", "float", "生产设备"],
+        [None, None, None, None],
+        ["A", "运行状态", "bool", "生产设备"],
+        [None, "电流", "float", "生产设备"],
+        ["B", "　运行状态\n", "", None],
+    ])
+
+    with read_point_rows(xlsx) as rows:
+        assert rows.columns == ["设备名称", "采集点名称", "数据类型", "设备属性"]
+        total, written = export_to_sqlite(db_path, rows.columns, rows, batch_size=2)
+        assert rows.rejected == [(7, "设备名称", "为空")]
+
+    assert (total, written) == (4, 3)
+    assert fetch_points(db_path) == [
+        ("A", "温度", "float", "生产设备"),
+        ("A", "运行状态", "bool", "生产设备"),
+        ("B", "运行状态", None, None),
+    ]
+
+
+def test_read_point_rows_rejects_rows_failing_dictionary(tmp_path):
+    xlsx = tmp_path / "points.xlsx"
+    build_workbook(xlsx, [
+        ["A", "运行状态", "int", "生产设备"],
+        ["A", "温度", "float", "未知设备"],
+        ["B", "电流", None, "能源设备"],
+    ])
+
+    with read_point_rows(xlsx, validate=load_validation_rules(DICT_FILE)) as rows:
+        assert [row[:2] for row in rows] == [("A", "运行状态")]
+        assert rows.rejected == [(4, "设备属性", "与字典不符"), (5, "数据类型", "为空")]
+
+
+def test_read_point_rows_rejects_rows_inconsistent_with_device(tmp_path):
+    xlsx = tmp_path / "points.xlsx"
+    build_workbook(xlsx, [
+        ["A", "运行状态", "一车间"],
+        ["A", "温度", "二车间"],
+        ["A", "电流", "一车间"],
+        ["B", "电流", "二车间"],
+    ], headers=("设备名称\n（必填）", "采集点名称", "车间\n（必选）"))
+
+    with read_point_rows(xlsx, check_groups=True) as rows:
+        assert [row[:2] for row in rows] == [("A", "运行状态"), ("A", "电流"), ("B", "电流")]
+        assert rows.rejected == [(4, "车间", "与同一设备的参考值'一车间'不一致")]
+
+
+def test_load_validation_rules_missing_dict_file(tmp_path):
+    with pytest.raises(FileNotFoundError, match="选择校验字典"):
+        load_validation_rules(str(tmp_path / "missing.md"))